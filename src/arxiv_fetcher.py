@@ -7,13 +7,64 @@ This module handles querying the arXiv API for recent papers matching
 specified keywords and categories.
 """
 
-import urllib.request
+import io
+import logging
 import urllib.parse
-import xml.etree.ElementTree as ET
 from datetime import datetime, timedelta, timezone
-from typing import List, Dict, Optional
+from typing import Iterator, List, Dict, Optional
 import time
 
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from cache import FeedCache
+from concurrency import get_executor
+
+
+logger = logging.getLogger(__name__)
+
+try:
+    from lxml import etree as ET
+    HAS_LXML = True
+except ImportError:
+    import xml.etree.ElementTree as ET
+    HAS_LXML = False
+
+
+# Atom tags in Clark notation
+ATOM_NS = 'http://www.w3.org/2005/Atom'
+ATOM = f'{{{ATOM_NS}}}'
+ENTRY_TAG = f'{ATOM}entry'
+ID_TAG = f'{ATOM}id'
+TITLE_TAG = f'{ATOM}title'
+SUMMARY_TAG = f'{ATOM}summary'
+PUBLISHED_TAG = f'{ATOM}published'
+UPDATED_TAG = f'{ATOM}updated'
+AUTHOR_TAG = f'{ATOM}author'
+NAME_TAG = f'{ATOM}name'
+LINK_TAG = f'{ATOM}link'
+
+if HAS_LXML:
+    # Precompiled XPath is faster than findtext() for this per-entry lookup
+    _published_text = ET.XPath('string(atom:published)',
+                               namespaces={'atom': ATOM_NS})
+else:
+    def _published_text(entry) -> Optional[str]:
+        return entry.findtext(PUBLISHED_TAG)
+
+
+# Shared session so connections are kept alive across queries; arXiv
+# frequently answers with 503 under load, so retry with backoff.
+_session = requests.Session()
+_session.mount('http://', HTTPAdapter(
+    pool_connections=4,
+    pool_maxsize=8,
+    max_retries=Retry(total=3, backoff_factor=1,
+                      status_forcelist=[429, 500, 502, 503, 504])
+))
+_session.mount('https://', _session.get_adapter('http://'))
+
 
 class ArxivFetcher:
     """Fetches papers from arXiv API based on search criteria."""
@@ -22,7 +73,7 @@ class ArxivFetcher:
     NAMESPACE = {'atom': 'http://www.w3.org/2005/Atom'}
     
     def __init__(self, categories: List[str], time_window_hours: int = 24, 
-                 max_results: int = 100):
+                 max_results: int = 100, cache: Optional[FeedCache] = None):
         """
         Initialize the arXiv fetcher.
         
@@ -30,12 +81,16 @@ class ArxivFetcher:
             categories: List of arXiv categories (e.g., ['cond-mat.mtrl-sci'])
             time_window_hours: How many hours back to search
             max_results: Maximum number of results to retrieve
+            cache: Optional cache of earlier responses for conditional requests
         """
         self.categories = categories
         self.time_window_hours = time_window_hours
         self.max_results = max_results
+        self.cache = cache
         # Make cutoff_date timezone-aware (UTC)
         self.cutoff_date = datetime.now(timezone.utc) - timedelta(hours=time_window_hours)
+        # arXiv timestamps are ISO 8601 UTC, which compare correctly as strings
+        self.cutoff_date_str = self.cutoff_date.strftime('%Y-%m-%dT%H:%M:%SZ')
     
     def build_query(self, keyword_groups: List[List[str]]) -> str:
         """
@@ -55,13 +110,7 @@ class ArxivFetcher:
         cat_query = " OR ".join([f"cat:{cat}" for cat in self.categories])
         
         # Build keyword part
-        keyword_parts = []
-        for group in keyword_groups:
-            if len(group) == 1:
-                keyword_parts.append(f"all:{group[0]}")
-            else:
-                and_terms = " AND ".join([f"all:{kw}" for kw in group])
-                keyword_parts.append(f"({and_terms})")
+        keyword_parts = [self._build_group_query(group) for group in keyword_groups]
         
         keyword_query = " OR ".join(keyword_parts)
         
@@ -70,6 +119,22 @@ class ArxivFetcher:
         
         return full_query
     
+    def _build_group_query(self, group: List[str]) -> str:
+        """
+        Build the query expression for a single keyword group.
+        
+        Args:
+            group: Keywords that must all match
+            
+        Returns:
+            Query expression, e.g. (all:dislocation AND all:MD)
+        """
+        if len(group) == 1:
+            return f"all:{group[0]}"
+        
+        and_terms = " AND ".join([f"all:{kw}" for kw in group])
+        return f"({and_terms})"
+    
     def fetch_papers(self, keyword_groups: List[List[str]]) -> List[Dict]:
         """
         Fetch papers from arXiv matching the criteria.
@@ -83,6 +148,63 @@ class ArxivFetcher:
         """
         query = self.build_query(keyword_groups)
         
+        papers = [
+            paper for paper in self._fetch_query(query)
+            if paper['published'] >= self.cutoff_date
+        ]
+        
+        logger.info("Found %d papers in the last %d hours",
+                    len(papers), self.time_window_hours)
+        return papers
+    
+    def fetch_papers_parallel(self, keyword_groups: List[List[str]]) -> List[Dict]:
+        """
+        Fetch papers with one concurrent query per category and keyword group.
+        
+        Smaller queries are cheaper for arXiv to evaluate, and each one gets
+        its own max_results budget instead of sharing a single one.
+        
+        Args:
+            keyword_groups: List of keyword lists for Boolean search
+            
+        Returns:
+            List of paper dictionaries (see fetch_papers), newest first
+        """
+        queries = [
+            f"cat:{cat} AND {self._build_group_query(group)}"
+            for cat in self.categories
+            for group in keyword_groups
+        ]
+        
+        results = list(get_executor().map(self._fetch_query, queries))
+        
+        # Papers can match several categories and keyword groups
+        merged = {}
+        for result in results:
+            for paper in result:
+                merged[paper['id']] = paper
+        
+        papers = [
+            paper for paper in merged.values()
+            if paper['published'] >= self.cutoff_date
+        ]
+        papers.sort(key=lambda paper: paper['published'], reverse=True)
+        
+        logger.info("Found %d papers in the last %d hours",
+                    len(papers), self.time_window_hours)
+        return papers
+    
+    def _fetch_query(self, query: str) -> List[Dict]:
+        """
+        Run a single arXiv API query.
+        
+        Args:
+            query: Query string for arXiv API
+            
+        Returns:
+            List of parsed paper dictionaries, stopping at the first paper
+            published before the cutoff date
+        """
         # Build URL with parameters
         params = {
             'search_query': query,
@@ -94,32 +216,91 @@ class ArxivFetcher:
         
         url = f"{self.BASE_URL}?{urllib.parse.urlencode(params)}"
         
-        print(f"Querying arXiv with: {query}")
-        print(f"Full URL: {url}\n")
+        logger.info("Querying arXiv with: %s", query)
+        logger.info("Full URL: %s", url)
+        
+        # Ask arXiv to skip the body if nothing changed since the last run
+        headers = {'Accept-Encoding': 'gzip'}
+        cached = self.cache.get_validators(url) if self.cache else None
+        # Cached papers stop at the cutoff of the run that stored them, so
+        # they only cover this run's window if that cutoff was not later
+        if cached and cached['cutoff'] > self.cutoff_date_str:
+            cached = None
+        if cached:
+            if cached['etag']:
+                headers['If-None-Match'] = cached['etag']
+            if cached['last_modified']:
+                headers['If-Modified-Since'] = cached['last_modified']
         
         # Make request
         try:
-            with urllib.request.urlopen(url) as response:
-                data = response.read()
+            response = _session.get(self.BASE_URL, params=params,
+                                    headers=headers, timeout=30)
+            if response.status_code == 304 and cached:
+                logger.info("Results unchanged since last run, using cached papers")
+                return self.cache.get_papers(url)
+            
+            response.raise_for_status()
+            data = response.content
         except Exception as e:
-            print(f"Error fetching from arXiv: {e}")
+            logger.error("Error fetching from arXiv: %s", e)
             return []
         
-        # Parse XML response
-        root = ET.fromstring(data)
-        
         papers = []
-        for entry in root.findall('atom:entry', self.NAMESPACE):
-            paper = self._parse_entry(entry)
+        for entry in self._iter_entries(data):
+            # Results are sorted newest first, so everything after the first
+            # entry outside the time window can be skipped unparsed
+            published_str = _published_text(entry)
+            if published_str and published_str < self.cutoff_date_str:
+                break
             
-            # Filter by date
-            if paper and paper['published'] >= self.cutoff_date:
+            paper = self._parse_entry(entry)
+            if paper:
                 papers.append(paper)
         
-        print(f"Found {len(papers)} papers in the last {self.time_window_hours} hours")
+        etag = response.headers.get('ETag')
+        last_modified = response.headers.get('Last-Modified')
+        if self.cache and (etag or last_modified):
+            self.cache.set(url, etag, last_modified, self.cutoff_date_str, papers)
+        
         return papers
     
-    def _parse_entry(self, entry: ET.Element) -> Optional[Dict]:
+    def _iter_entries(self, data: bytes) -> Iterator:
+        """
+        Iterate over the entries of an arXiv Atom response.
+        
+        The response is streamed and each entry is discarded once the
+        caller has processed it, so only one entry is held in memory.
+        
+        Args:
+            data: Raw XML response
+            
+        Yields:
+            XML element for each paper
+        """
+        if HAS_LXML:
+            # Never expand external entities (lxml < 5 did so by default);
+            # ElementTree rejects them outright
+            for _, entry in ET.iterparse(io.BytesIO(data), events=('end',),
+                                         tag=ENTRY_TAG, resolve_entities=False,
+                                         no_network=True):
+                yield entry
+                
+                # Free the entry and any already processed siblings
+                entry.clear()
+                while entry.getprevious() is not None:
+                    del entry.getparent()[0]
+        else:
+            # ElementTree has no parent pointers, so keep the feed root from
+            # the first start event and empty it after each entry
+            context = ET.iterparse(io.BytesIO(data), events=('start', 'end'))
+            _, root = next(context)
+            for event, entry in context:
+                if event == 'end' and entry.tag == ENTRY_TAG:
+                    yield entry
+                    root.clear()
+    
+    def _parse_entry(self, entry) -> Optional[Dict]:
         """
         Parse a single entry from arXiv XML response.
         
@@ -130,30 +311,41 @@ class ArxivFetcher:
             Dictionary with paper information
         """
         try:
-            # Extract basic info
-            arxiv_id = entry.find('atom:id', self.NAMESPACE).text
-            title = entry.find('atom:title', self.NAMESPACE).text.strip()
-            abstract = entry.find('atom:summary', self.NAMESPACE).text.strip()
+            arxiv_id = title = abstract = None
+            published_str = updated_str = pdf_url = None
+            authors = []
+            
+            # Collect all fields in a single pass over the entry's children
+            for child in entry:
+                tag = child.tag
+                if tag == AUTHOR_TAG:
+                    authors.append(child.findtext(NAME_TAG))
+                elif tag == LINK_TAG:
+                    if child.get('title') == 'pdf':
+                        pdf_url = child.get('href')
+                        # arXiv lists authors before links, so once the PDF
+                        # link is seen only categories can remain
+                        if (arxiv_id and title and abstract
+                                and published_str and updated_str):
+                            break
+                elif tag == ID_TAG:
+                    arxiv_id = child.text
+                elif tag == TITLE_TAG:
+                    title = child.text
+                elif tag == SUMMARY_TAG:
+                    abstract = child.text
+                elif tag == PUBLISHED_TAG:
+                    published_str = child.text
+                elif tag == UPDATED_TAG:
+                    updated_str = child.text
+            
+            title = title.strip()
+            abstract = abstract.strip()
             
             # Parse dates
-            published_str = entry.find('atom:published', self.NAMESPACE).text
-            updated_str = entry.find('atom:updated', self.NAMESPACE).text
             published = datetime.fromisoformat(published_str.replace('Z', '+00:00'))
             updated = datetime.fromisoformat(updated_str.replace('Z', '+00:00'))
             
-            # Extract authors
-            authors = []
-            for author in entry.findall('atom:author', self.NAMESPACE):
-                name = author.find('atom:name', self.NAMESPACE).text
-                authors.append(name)
-            
-            # Get PDF link
-            pdf_url = None
-            for link in entry.findall('atom:link', self.NAMESPACE):
-                if link.get('title') == 'pdf':
-                    pdf_url = link.get('href')
-                    break
-            
             return {
                 'id': arxiv_id.split('/abs/')[-1],
                 'title': title,
@@ -165,7 +357,7 @@ class ArxivFetcher:
                 'arxiv_url': arxiv_id
             }
         except Exception as e:
-            print(f"Error parsing entry: {e}")
+            logger.warning("Error parsing entry: %s", e)
             return None
 
 
@@ -195,4 +387,5 @@ def test_fetcher():
 
 
 if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
     test_fetcher()
\ No newline at end of file
@@ -0,0 +1,204 @@
+"""
+Persistent cache module
+Copyright (c) 2025 Erik Bitzek
+Licensed under GNU AGPL v3
+
+This module stores generated summaries and arXiv responses in a local
+SQLite database so that unchanged results are not fetched or summarized
+again.
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional, Union
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+DEFAULT_CACHE_PATH = '~/.cache/arxiv-daily-digest/summaries.sqlite'
+
+
+def _connect(path: str) -> sqlite3.Connection:
+    """
+    Open the cache database, creating its directory if needed.
+
+    Args:
+        path: Path to the SQLite file
+
+    Returns:
+        Open database connection
+    """
+    path = os.path.expanduser(path)
+    Path(path).parent.mkdir(parents=True, exist_ok=True)
+
+    conn = sqlite3.connect(path, check_same_thread=False)
+    # WAL lets concurrent runs read while another writes
+    conn.execute("PRAGMA journal_mode=WAL")
+    return conn
+
+
+def abstract_hash(abstract: str) -> str:
+    """Hash an abstract so that revised papers invalidate their summary."""
+    return hashlib.sha1(abstract.encode('utf-8')).hexdigest()
+
+
+class _SQLiteCache:
+    """Base class owning a connection shared between threads."""
+
+    SCHEMA = ""
+
+    def __init__(self, path: str = DEFAULT_CACHE_PATH):
+        """
+        Initialize the cache.
+
+        Args:
+            path: Path to the SQLite database file
+        """
+        self.path = path
+        self._conn = _connect(path)
+        # The connection is shared by the thread pool's workers
+        self._lock = threading.Lock()
+
+        with self._lock, self._conn:
+            self._conn.execute(self.SCHEMA)
+
+    def close(self) -> None:
+        """Close the database connection."""
+        self._conn.close()
+
+
+class SummaryCache(_SQLiteCache):
+    """Stores paper summaries keyed by arXiv ID, model and abstract."""
+
+    SCHEMA = (
+        "CREATE TABLE IF NOT EXISTS summaries ("
+        "arxiv_id TEXT PRIMARY KEY, model TEXT, summary TEXT, "
+        "abstract_hash TEXT)"
+    )
+
+    def get(self, paper: Dict, model: str) -> Optional[str]:
+        """
+        Look up a cached summary.
+
+        Args:
+            paper: Paper dictionary (uses 'id' and 'abstract')
+            model: Model the summary must have been generated with
+
+        Returns:
+            Cached summary, or None if missing or stale
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT summary FROM summaries "
+                "WHERE arxiv_id = ? AND model = ? AND abstract_hash = ?",
+                (paper['id'], model, abstract_hash(paper['abstract']))
+            ).fetchone()
+
+        return row[0] if row else None
+
+    def set(self, paper: Dict, model: str, summary: str) -> None:
+        """
+        Store a summary, replacing any previous entry for the paper.
+
+        Args:
+            paper: Paper dictionary (uses 'id' and 'abstract')
+            model: Model the summary was generated with
+            summary: Generated summary
+        """
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO summaries VALUES (?, ?, ?, ?)",
+                (paper['id'], model, summary, abstract_hash(paper['abstract']))
+            )
+
+
+def _encode_papers(papers: List[Dict]) -> Union[bytes, str]:
+    """Serialize paper dictionaries, storing dates as ISO 8601 strings."""
+    if orjson:
+        # orjson encodes datetimes natively and is much faster than json
+        return orjson.dumps(papers)
+    return json.dumps(papers, default=datetime.isoformat)
+
+
+def _decode_papers(data: Union[bytes, str]) -> List[Dict]:
+    """Deserialize paper dictionaries stored by _encode_papers."""
+    papers = orjson.loads(data) if orjson else json.loads(data)
+    for paper in papers:
+        paper['published'] = datetime.fromisoformat(paper['published'])
+        paper['updated'] = datetime.fromisoformat(paper['updated'])
+    return papers
+
+
+class FeedCache(_SQLiteCache):
+    """Stores arXiv query results with their HTTP cache validators."""
+
+    SCHEMA = (
+        "CREATE TABLE IF NOT EXISTS feeds ("
+        "query TEXT PRIMARY KEY, etag TEXT, last_modified TEXT, "
+        "cutoff TEXT, papers TEXT)"
+    )
+
+    def get_validators(self, query: str) -> Optional[Dict]:
+        """
+        Look up the cache validators of the last response for a query.
+
+        Args:
+            query: Full query URL
+
+        Returns:
+            Dictionary with keys etag, last_modified and cutoff,
+            or None if the query has not been cached
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT etag, last_modified, cutoff FROM feeds WHERE query = ?",
+                (query,)
+            ).fetchone()
+
+        if not row:
+            return None
+
+        return {'etag': row[0], 'last_modified': row[1], 'cutoff': row[2]}
+
+    def get_papers(self, query: str) -> List[Dict]:
+        """
+        Load the papers cached for a query.
+
+        Args:
+            query: Full query URL
+
+        Returns:
+            Parsed papers from the last response (empty if not cached)
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT papers FROM feeds WHERE query = ?", (query,)
+            ).fetchone()
+
+        return _decode_papers(row[0]) if row else []
+
+    def set(self, query: str, etag: Optional[str], last_modified: Optional[str],
+            cutoff: str, papers: List[Dict]) -> None:
+        """
+        Store the response for a query.
+
+        Args:
+            query: Full query URL
+            etag: ETag response header
+            last_modified: Last-Modified response header
+            cutoff: Date cutoff (ISO 8601 UTC) the papers were filtered with
+            papers: Parsed papers from the response
+        """
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO feeds VALUES (?, ?, ?, ?, ?)",
+                (query, etag, last_modified, cutoff, _encode_papers(papers))
+            )
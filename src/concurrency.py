@@ -0,0 +1,30 @@
+"""
+Shared thread pool module
+Copyright (c) 2025 Erik Bitzek
+Licensed under GNU AGPL v3
+
+This module provides a single thread pool that is reused by the fetching
+and summarizing stages instead of each creating its own.
+"""
+
+import atexit
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+
+
+# Maximum number of concurrent network requests
+MAX_WORKERS = 8
+
+
+@lru_cache(maxsize=None)
+def get_executor() -> ThreadPoolExecutor:
+    """
+    Get the shared thread pool, creating it on first use.
+
+    Returns:
+        Thread pool shut down automatically at interpreter exit
+    """
+    executor = ThreadPoolExecutor(max_workers=MAX_WORKERS,
+                                  thread_name_prefix='digest')
+    atexit.register(executor.shutdown)
+    return executor
@@ -4,18 +4,18 @@ Copyright (c) 2025 Erik Bitzek
 Licensed under GNU AGPL v3
 
 This module coordinates fetching, summarizing, and outputting the daily digest.
+
+Heavy dependencies (yaml, requests, openai) are imported only when they are
+needed, so that --help and early failures start quickly.
 """
 
+import argparse
+import logging
 import os
 import sys
-import yaml
 from pathlib import Path
 from typing import Dict, Any
 
-from arxiv_fetcher import ArxivFetcher
-from summarizer import PaperSummarizer
-from notifier import DigestNotifier
-
 
 def load_config(config_path: str = 'config.yml') -> Dict[str, Any]:
     """
@@ -27,6 +27,14 @@ def load_config(config_path: str = 'config.yml') -> Dict[str, Any]:
     Returns:
         Configuration dictionary
     """
+    import yaml
+    
+    # Prefer the libyaml-based loader when PyYAML was built with it
+    try:
+        from yaml import CSafeLoader as SafeLoader
+    except ImportError:
+        from yaml import SafeLoader
+    
     # If relative path, look in project root (parent of src/)
     if not os.path.isabs(config_path):
         # Get the directory containing this script
@@ -36,7 +44,7 @@ def load_config(config_path: str = 'config.yml') -> Dict[str, Any]:
     
     try:
         with open(config_path, 'r') as f:
-            config = yaml.safe_load(f)
+            config = yaml.load(f, Loader=SafeLoader)
         return config
     except FileNotFoundError:
         print(f"Error: Configuration file '{config_path}' not found")
@@ -64,12 +72,22 @@ def run_digest(config_path: str = 'config.yml', dry_run: bool = False) -> None:
     print("Loading configuration...")
     config = load_config(config_path)
     
+    from arxiv_fetcher import ArxivFetcher
+    from cache import FeedCache, SummaryCache, DEFAULT_CACHE_PATH
+    
+    cache_config = config.get('cache', {})
+    cache_path = cache_config.get('path', DEFAULT_CACHE_PATH)
+    cache_enabled = cache_config.get('enabled', False)
+    if cache_enabled:
+        print(f"Using cache: {cache_path}")
+    
     # Initialize fetcher
     print("Initializing arXiv fetcher...")
     fetcher = ArxivFetcher(
         categories=config['arxiv']['categories'],
         time_window_hours=config['arxiv']['time_window_hours'],
-        max_results=config['arxiv']['max_results']
+        max_results=config['arxiv']['max_results'],
+        cache=FeedCache(cache_path) if cache_enabled else None
     )
     
     # Fetch papers
@@ -78,7 +96,10 @@ def run_digest(config_path: str = 'config.yml', dry_run: bool = False) -> None:
     print(f"Time window: Last {config['arxiv']['time_window_hours']} hours")
     print()
     
-    papers = fetcher.fetch_papers(config['keywords'])
+    if config['arxiv'].get('parallel_queries', False):
+        papers = fetcher.fetch_papers_parallel(config['keywords'])
+    else:
+        papers = fetcher.fetch_papers(config['keywords'])
     
     if not papers:
         print("\nNo papers found matching your criteria.")
@@ -94,11 +115,16 @@ def run_digest(config_path: str = 'config.yml', dry_run: bool = False) -> None:
     
     # Initialize summarizer
     print("Initializing OpenAI summarizer...")
+    from summarizer import PaperSummarizer
+    
     try:
         summarizer = PaperSummarizer(
             model=config['openai']['model'],
             max_tokens=config['openai']['max_tokens'],
-            temperature=config['openai']['temperature']
+            temperature=config['openai']['temperature'],
+            cache=SummaryCache(cache_path) if cache_enabled else None,
+            max_retries=config['openai'].get('max_retries', 5),
+            max_words=config['openai'].get('max_words', 120)
         )
     except ValueError as e:
         print(f"Error: {e}")
@@ -114,7 +140,11 @@ def run_digest(config_path: str = 'config.yml', dry_run: bool = False) -> None:
         # Generate summaries
         print(f"\nGenerating AI summaries for {len(papers)} papers...")
         print("(This may take a minute...)\n")
-        summarized_papers = summarizer.summarize_papers(papers)
+        if config['openai'].get('use_batch', False):
+            print("Using the OpenAI Batch API (results may take a while)...\n")
+            summarized_papers = summarizer.summarize_papers_batch(papers)
+        else:
+            summarized_papers = summarizer.summarize_papers(papers)
     
     # Output digest
     if dry_run:
@@ -137,6 +167,8 @@ def run_digest(config_path: str = 'config.yml', dry_run: bool = False) -> None:
         script_dir = Path(__file__).parent
         output_file = script_dir.parent / output_file
     
+    from notifier import DigestNotifier
+    
     notifier = DigestNotifier(
         output_format=config['output']['format'],
         output_file=str(output_file),
@@ -157,8 +189,6 @@ def run_digest(config_path: str = 'config.yml', dry_run: bool = False) -> None:
 
 def main():
     """Entry point for the script."""
-    import argparse
-    
     parser = argparse.ArgumentParser(
         description='Generate daily arXiv digest with AI summaries'
     )
@@ -175,6 +205,13 @@ def main():
     
     args = parser.parse_args()
     
+    # Fetcher and summarizer report progress through logging; keep
+    # third-party libraries (openai, httpx) at their quieter defaults
+    logging.basicConfig(level=logging.WARNING, format='%(message)s',
+                        stream=sys.stdout)
+    for name in ('arxiv_fetcher', 'summarizer'):
+        logging.getLogger(name).setLevel(logging.INFO)
+    
     try:
         run_digest(args.config, args.dry_run)
     except KeyboardInterrupt:
@@ -12,7 +12,7 @@ import smtplib
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
 from datetime import datetime
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Union
 
 
 class DigestNotifier:
@@ -146,14 +146,17 @@ class DigestNotifier:
         except Exception as e:
             print(f"Error saving to file: {e}")
     
-    def send_email(self, content: str, recipient: str, 
+    def send_email(self, content: str, recipient: Union[str, List[str]], 
                    subject: Optional[str] = None) -> bool:
         """
         Send digest via email.
         
+        Multiple recipients receive a single message sent over one SMTP
+        connection, with their addresses hidden from each other (BCC).
+        
         Args:
             content: Formatted digest content
-            recipient: Email address to send to
+            recipient: Email address, or list of addresses, to send to
             subject: Email subject (auto-generated if None)
             
         Returns:
@@ -165,6 +168,8 @@ class DigestNotifier:
         smtp_user = os.getenv('SMTP_USER')
         smtp_password = os.getenv('SMTP_PASSWORD')
         
+        recipients = [recipient] if isinstance(recipient, str) else list(recipient)
+        
         print("\n" + "="*80)
         print("EMAIL DEBUG INFORMATION")
         print("="*80)
@@ -172,7 +177,7 @@ class DigestNotifier:
         print(f"SMTP Port: {smtp_port}")
         print(f"SMTP User: {smtp_user}")
         print(f"SMTP Password set: {'Yes' if smtp_password else 'No'}")
-        print(f"Recipient: {recipient}")
+        print(f"Recipient(s): {', '.join(recipients)}")
         print(f"Content length: {len(content)} characters")
         print("="*80 + "\n")
         
@@ -186,35 +191,41 @@ class DigestNotifier:
         # Create message
         msg = MIMEMultipart()
         msg['From'] = smtp_user
-        msg['To'] = recipient
+        # Address multiple recipients as BCC so they don't see each other
+        msg['To'] = recipients[0] if len(recipients) == 1 else smtp_user
         msg['Subject'] = subject or f"arXiv Daily Digest - {datetime.now().strftime('%Y-%m-%d')}"
         
         msg.attach(MIMEText(content, 'plain'))
         
         print("Attempting to send email...")
         print(f"  From: {smtp_user}")
-        print(f"  To: {recipient}")
+        print(f"  To: {', '.join(recipients)}")
         print(f"  Subject: {msg['Subject']}\n")
         
         # Send email
         try:
             print(f"Connecting to {smtp_server}:{smtp_port}...")
-            server = smtplib.SMTP(smtp_server, smtp_port, timeout=30)
+            if smtp_port == 465:
+                # Implicit TLS saves the STARTTLS round trip
+                server = smtplib.SMTP_SSL(smtp_server, smtp_port, timeout=30)
+            else:
+                server = smtplib.SMTP(smtp_server, smtp_port, timeout=30)
             server.set_debuglevel(1)  # Enable verbose SMTP debugging
             
-            print("Starting TLS...")
-            server.starttls()
+            if smtp_port != 465:
+                print("Starting TLS...")
+                server.starttls()
             
             print(f"Logging in as {smtp_user}...")
             server.login(smtp_user, smtp_password)
             
             print("Sending message...")
-            server.send_message(msg)
+            server.send_message(msg, to_addrs=recipients)
             
             print("Closing connection...")
             server.quit()
             
-            print(f"\n✅ SUCCESS: Digest sent to {recipient}")
+            print(f"\n✅ SUCCESS: Digest sent to {', '.join(recipients)}")
             return True
             
         except smtplib.SMTPAuthenticationError as e:
@@ -244,13 +255,14 @@ class DigestNotifier:
             return False
     
     def output_digest(self, papers: List[Dict], 
-                     email_recipient: Optional[str] = None) -> None:
+                     email_recipient: Optional[Union[str, List[str]]] = None) -> None:
         """
         Output digest according to configured format.
         
         Args:
             papers: List of paper dictionaries with summaries
-            email_recipient: Email address (required if format includes email)
+            email_recipient: Email address or list of addresses
+                (required if format includes email)
         """
         content = self.format_digest(papers)
         
@@ -6,16 +6,54 @@ Licensed under GNU AGPL v3
 This module uses OpenAI's API to generate concise summaries of arXiv papers.
 """
 
+import io
+import json
+import logging
 import os
+import re
+import time
+from concurrent.futures import as_completed
 from typing import List, Dict, Optional
 from openai import OpenAI
 
+from cache import SummaryCache
+from concurrency import get_executor
+
+
+logger = logging.getLogger(__name__)
+
+
+SYSTEM_PROMPT = (
+    "You are a materials science researcher. Summarize "
+    "academic papers concisely, focusing on key findings, "
+    "methods, and significance. Keep summaries under 100 words."
+)
+
+PROMPT_TEMPLATE = """Title: {title}
+
+Authors: {authors}
+
+Abstract: {abstract}
+
+Please provide a concise summary (2-3 sentences) highlighting:
+1. What problem/question the paper addresses
+2. The main approach or method used
+3. Key findings or contributions
+
+Keep it accessible to materials science researchers."""
+
+# Everything up to the last sentence-ending punctuation
+_COMPLETE_SENTENCES = re.compile(r'.*[.!?](?=\s|$)', re.DOTALL)
+
 
 class PaperSummarizer:
     """Generates AI summaries of academic papers using OpenAI."""
     
     def __init__(self, model: str = "gpt-4o-mini", max_tokens: int = 150,
-                 temperature: float = 0.3):
+                 temperature: float = 0.3,
+                 cache: Optional[SummaryCache] = None,
+                 max_retries: int = 5,
+                 max_words: Optional[int] = 120):
         """
         Initialize the summarizer.
         
@@ -23,10 +61,20 @@ class PaperSummarizer:
             model: OpenAI model to use (gpt-4o-mini is cost-effective)
             max_tokens: Maximum tokens for each summary
             temperature: Sampling temperature (0-1, lower = more focused)
+            cache: Optional cache of previously generated summaries
+            max_retries: How often to retry rate-limited or failed requests
+            max_words: Stop streaming a summary once it reaches this many
+                words and keep only its complete sentences (None to always
+                read the full response)
         """
         self.model = model
         self.max_tokens = max_tokens
         self.temperature = temperature
+        self.cache = cache
+        self.max_words = max_words
+        
+        # Identical for every paper, so build it only once
+        self._system_msg = {"role": "system", "content": SYSTEM_PROMPT}
         
         # Initialize OpenAI client
         api_key = os.getenv('OPENAI_API_KEY')
@@ -36,7 +84,9 @@ class PaperSummarizer:
                 "Please set it with your OpenAI API key."
             )
         
-        self.client = OpenAI(api_key=api_key)
+        # The client retries rate limits (429), server errors and connection
+        # failures with exponential backoff, honoring Retry-After headers
+        self.client = OpenAI(api_key=api_key, max_retries=max_retries)
     
     def summarize_paper(self, paper: Dict) -> Optional[str]:
         """
@@ -48,34 +98,54 @@ class PaperSummarizer:
         Returns:
             AI-generated summary string, or None if error occurs
         """
-        prompt = self._build_prompt(paper)
+        if self.cache:
+            cached = self.cache.get(paper, self.model)
+            if cached:
+                return cached
         
         try:
-            response = self.client.chat.completions.create(
+            # Stream the response so overly long summaries can be cut short
+            stream = self.client.chat.completions.create(
                 model=self.model,
-                messages=[
-                    {
-                        "role": "system",
-                        "content": (
-                            "You are a materials science researcher. Summarize "
-                            "academic papers concisely, focusing on key findings, "
-                            "methods, and significance. Keep summaries under 100 words."
-                        )
-                    },
-                    {
-                        "role": "user",
-                        "content": prompt
-                    }
-                ],
+                messages=self._build_messages(paper),
                 max_tokens=self.max_tokens,
-                temperature=self.temperature
+                temperature=self.temperature,
+                stream=True
             )
             
-            summary = response.choices[0].message.content.strip()
+            text = ""
+            truncated = False
+            try:
+                for chunk in stream:
+                    if not chunk.choices:
+                        continue
+                    
+                    text += chunk.choices[0].delta.content or ""
+                    if self.max_words and len(text.split()) >= self.max_words:
+                        truncated = True
+                        break
+            finally:
+                stream.close()
+            
+            complete = True
+            if truncated:
+                # Drop the sentence that was cut off mid-way
+                match = _COMPLETE_SENTENCES.match(text)
+                if match:
+                    text = match.group(0)
+                else:
+                    complete = False
+            
+            summary = text.strip()
+            
+            # Don't persist a summary that ends mid-sentence
+            if self.cache and complete:
+                self.cache.set(paper, self.model, summary)
+            
             return summary
             
         except Exception as e:
-            print(f"Error generating summary for '{paper['title']}': {e}")
+            logger.error("Error generating summary for '%s': %s", paper['title'], e)
             return None
     
     def summarize_papers(self, papers: List[Dict], 
@@ -83,28 +153,195 @@ class PaperSummarizer:
         """
         Generate summaries for multiple papers.
         
+        Requests are I/O-bound, so they are issued concurrently from the
+        shared thread pool, all using the same OpenAI client.
+        
         Args:
             papers: List of paper dictionaries
             show_progress: Whether to print progress updates
             
         Returns:
-            List of paper dictionaries with added 'summary' field
+            The input papers, each updated in place with a 'summary' field
+        """
+        summaries: List[Optional[str]] = [None] * len(papers)
+        
+        executor = get_executor()
+        futures = {
+            executor.submit(self.summarize_paper, paper): i
+            for i, paper in enumerate(papers)
+        }
+        
+        for done, future in enumerate(as_completed(futures), 1):
+            i = futures[future]
+            try:
+                summaries[i] = future.result()
+            except Exception as e:
+                logger.error("Error generating summary for '%s': %s", papers[i]['title'], e)
+            
+            # Skip formatting entirely when progress output is silenced
+            if show_progress and logger.isEnabledFor(logging.INFO):
+                logger.info("Summarized paper %d/%d: %s...",
+                            done, len(papers), papers[i]['title'][:60])
+        
+        for paper, summary in zip(papers, summaries):
+            paper['summary'] = summary if summary else "Summary unavailable"
+        
+        return papers
+    
+    def summarize_papers_batch(self, papers: List[Dict],
+                               show_progress: bool = True,
+                               poll_interval: int = 30,
+                               timeout: int = 6 * 3600) -> List[Dict]:
         """
-        summarized = []
+        Generate summaries for multiple papers with the OpenAI Batch API.
         
-        for i, paper in enumerate(papers, 1):
-            if show_progress:
-                print(f"Summarizing paper {i}/{len(papers)}: {paper['title'][:60]}...")
+        All prompts are submitted as a single batch job, which is billed at
+        a lower rate than real-time requests but may take a while to
+        complete. Falls back to summarize_papers() if the batch fails or
+        does not finish within the timeout, and for papers whose individual
+        requests failed within the batch.
+        
+        Args:
+            papers: List of paper dictionaries
+            show_progress: Whether to print progress updates
+            poll_interval: Seconds between batch status checks
+            timeout: Maximum seconds to wait for the batch to complete
             
-            summary = self.summarize_paper(paper)
+        Returns:
+            The input papers, each updated in place with a 'summary' field
+        """
+        summaries = {}
+        failed = []
+        
+        # Only submit papers that have no cached summary
+        pending = []
+        for paper in papers:
+            cached = self.cache.get(paper, self.model) if self.cache else None
+            if cached:
+                summaries[paper['id']] = cached
+            else:
+                pending.append(paper)
+        
+        if pending:
+            try:
+                batch_summaries = self._run_batch(pending, show_progress,
+                                                  poll_interval, timeout)
+            except Exception as e:
+                logger.warning("Batch summarization failed: %s", e)
+                logger.warning("Falling back to per-paper requests...")
+                return self.summarize_papers(papers, show_progress=show_progress)
             
-            # Add summary to paper dict
-            paper_with_summary = paper.copy()
-            paper_with_summary['summary'] = summary if summary else "Summary unavailable"
+            if self.cache:
+                for paper in pending:
+                    if paper['id'] in batch_summaries:
+                        self.cache.set(paper, self.model, batch_summaries[paper['id']])
             
-            summarized.append(paper_with_summary)
+            summaries.update(batch_summaries)
+            failed = [paper for paper in pending if not batch_summaries.get(paper['id'])]
+        
+        for paper in papers:
+            if summaries.get(paper['id']):
+                paper['summary'] = summaries[paper['id']]
+        
+        if failed:
+            logger.warning("%d batch requests failed, retrying them individually",
+                           len(failed))
+            self.summarize_papers(failed, show_progress=show_progress)
         
-        return summarized
+        return papers
+    
+    def _run_batch(self, papers: List[Dict], show_progress: bool,
+                   poll_interval: int, timeout: int) -> Dict[str, str]:
+        """
+        Submit a batch job and wait for its results.
+        
+        Args:
+            papers: List of paper dictionaries
+            show_progress: Whether to print progress updates
+            poll_interval: Seconds between batch status checks
+            timeout: Maximum seconds to wait for the batch to complete
+            
+        Returns:
+            Dictionary mapping paper id to summary (failed requests omitted)
+        """
+        # One chat completion request per line, matched back by custom_id
+        lines = []
+        for paper in papers:
+            request = {
+                "custom_id": paper['id'],
+                "method": "POST",
+                "url": "/v1/chat/completions",
+                "body": {
+                    "model": self.model,
+                    "messages": self._build_messages(paper),
+                    "max_tokens": self.max_tokens,
+                    "temperature": self.temperature
+                }
+            }
+            lines.append(json.dumps(request))
+        
+        batch_input = io.BytesIO("\n".join(lines).encode('utf-8'))
+        input_file = self.client.files.create(
+            file=("digest_batch.jsonl", batch_input),
+            purpose="batch"
+        )
+        
+        batch = self.client.batches.create(
+            input_file_id=input_file.id,
+            endpoint="/v1/chat/completions",
+            completion_window="24h"
+        )
+        
+        if show_progress:
+            logger.info("Submitted batch %s with %d papers", batch.id, len(papers))
+        
+        deadline = time.monotonic() + timeout
+        while batch.status not in ("completed", "failed", "expired", "cancelled"):
+            if time.monotonic() > deadline:
+                self.client.batches.cancel(batch.id)
+                raise TimeoutError(f"batch {batch.id} did not complete in {timeout}s")
+            
+            time.sleep(poll_interval)
+            batch = self.client.batches.retrieve(batch.id)
+            
+            if show_progress and batch.request_counts:
+                counts = batch.request_counts
+                logger.info("Batch status: %s (%d/%d completed)",
+                            batch.status, counts.completed, counts.total)
+        
+        if batch.status != "completed" or not batch.output_file_id:
+            raise RuntimeError(f"batch {batch.id} ended with status '{batch.status}'")
+        
+        output = self.client.files.content(batch.output_file_id).text
+        
+        summaries = {}
+        for line in output.splitlines():
+            if not line.strip():
+                continue
+            
+            result = json.loads(line)
+            response = result.get('response') or {}
+            if response.get('status_code') != 200:
+                logger.error("Error generating summary for '%s': %s",
+                             result['custom_id'], result.get('error'))
+                continue
+            
+            content = response['body']['choices'][0]['message']['content']
+            summaries[result['custom_id']] = content.strip()
+        
+        return summaries
+    
+    def _build_messages(self, paper: Dict) -> List[Dict]:
+        """
+        Build the chat messages for summarizing a paper.
+        
+        Args:
+            paper: Paper dictionary
+            
+        Returns:
+            System and user messages for the chat completions API
+        """
+        return [self._system_msg, {"role": "user", "content": self._build_prompt(paper)}]
     
     def _build_prompt(self, paper: Dict) -> str:
         """
@@ -120,20 +357,11 @@ class PaperSummarizer:
         if len(paper['authors']) > 3:
             authors_str += " et al."
         
-        prompt = f"""Title: {paper['title']}
-
-Authors: {authors_str}
-
-Abstract: {paper['abstract']}
-
-Please provide a concise summary (2-3 sentences) highlighting:
-1. What problem/question the paper addresses
-2. The main approach or method used
-3. Key findings or contributions
-
-Keep it accessible to materials science researchers."""
-        
-        return prompt
+        return PROMPT_TEMPLATE.format(
+            title=paper['title'],
+            authors=authors_str,
+            abstract=paper['abstract']
+        )
 
 
 def test_summarizer():
@@ -164,4 +392,5 @@ def test_summarizer():
 
 
 if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
     test_summarizer()
\ No newline at end of file
@@ -82,13 +82,19 @@ arXiv Daily Digest
     
     try:
         print(f"Step 1: Connecting to {smtp_server}:{smtp_port}...")
-        server = smtplib.SMTP(smtp_server, smtp_port, timeout=30)
+        if smtp_port == 465:
+            server = smtplib.SMTP_SSL(smtp_server, smtp_port, timeout=30)
+        else:
+            server = smtplib.SMTP(smtp_server, smtp_port, timeout=30)
         server.set_debuglevel(1)  # Show detailed SMTP conversation
         print("  ✓ Connected\n")
         
-        print("Step 2: Starting TLS encryption...")
-        server.starttls()
-        print("  ✓ TLS started\n")
+        if smtp_port == 465:
+            print("Step 2: Using implicit TLS (port 465)\n")
+        else:
+            print("Step 2: Starting TLS encryption...")
+            server.starttls()
+            print("  ✓ TLS started\n")
         
         print(f"Step 3: Logging in as {smtp_user}...")
         server.login(smtp_user, smtp_password)
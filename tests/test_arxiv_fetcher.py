@@ -6,12 +6,74 @@ Licensed under GNU AGPL v3
 
 import pytest
 import sys
+from datetime import datetime, timedelta, timezone
 from pathlib import Path
 
 # Add src to path for imports
 sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
 
+import arxiv_fetcher
 from arxiv_fetcher import ArxivFetcher
+from cache import FeedCache
+
+
+SAMPLE_FEED = b"""<?xml version="1.0" encoding="UTF-8"?>
+<feed xmlns="http://www.w3.org/2005/Atom">
+  <title>arXiv Query Results</title>
+  <entry>
+    <id>http://arxiv.org/abs/2401.00002v1</id>
+    <updated>2024-01-02T10:00:00Z</updated>
+    <published>2024-01-02T10:00:00Z</published>
+    <title>Dislocation Dynamics in
+      FCC Metals</title>
+    <summary>  We study dislocations.  </summary>
+    <author><name>Smith, J.</name></author>
+    <author><name>Doe, A.</name></author>
+    <link href="http://arxiv.org/abs/2401.00002v1" rel="alternate" type="text/html"/>
+    <link title="pdf" href="http://arxiv.org/pdf/2401.00002v1" rel="related" type="application/pdf"/>
+  </entry>
+  <entry>
+    <id>http://arxiv.org/abs/2401.00001v1</id>
+    <updated>2024-01-01T09:00:00Z</updated>
+    <published>2024-01-01T09:00:00Z</published>
+    <title>Grain Boundary Migration</title>
+    <summary>We study grain boundaries.</summary>
+    <author><name>Johnson, B.</name></author>
+  </entry>
+</feed>
+"""
+
+
+class FakeResponse:
+    """Minimal stand-in for requests.Response."""
+    
+    def __init__(self, status_code=200, content=SAMPLE_FEED, headers=None):
+        self.status_code = status_code
+        self.content = content
+        self.headers = headers or {}
+    
+    def raise_for_status(self):
+        pass
+
+
+@pytest.fixture
+def fake_arxiv(monkeypatch):
+    """
+    Serve SAMPLE_FEED with an ETag instead of querying arXiv.
+    
+    Answers 304 to requests carrying If-None-Match. Returns the list of
+    headers sent with each request.
+    """
+    sent_headers = []
+    
+    def fake_get(url, params, headers, timeout):
+        sent_headers.append(headers)
+        if 'If-None-Match' in headers:
+            return FakeResponse(304, b'', {'ETag': '"abc"'})
+        return FakeResponse(headers={'ETag': '"abc"'})
+    
+    monkeypatch.setattr('arxiv_fetcher._session.get', fake_get)
+    return sent_headers
 
 
 class TestArxivFetcher:
@@ -73,6 +135,114 @@ class TestArxivFetcher:
         assert 'cat:cond-mat.mtrl-sci' in query
         assert 'cat:physics.comp-ph' in query
         assert 'OR' in query  # Categories are OR'ed
+    
+    def test_parse_entries(self):
+        """Test parsing entries from an Atom response."""
+        fetcher = ArxivFetcher(categories=['cond-mat.mtrl-sci'])
+        
+        papers = [fetcher._parse_entry(e) for e in fetcher._iter_entries(SAMPLE_FEED)]
+        
+        assert [p['id'] for p in papers] == ['2401.00002v1', '2401.00001v1']
+        assert papers[0]['abstract'] == 'We study dislocations.'
+        assert papers[0]['authors'] == ['Smith, J.', 'Doe, A.']
+        assert papers[0]['pdf_url'] == 'http://arxiv.org/pdf/2401.00002v1'
+        assert papers[0]['published'].tzinfo is not None
+        assert papers[1]['pdf_url'] is None
+    
+    @pytest.mark.skipif(not arxiv_fetcher.HAS_LXML, reason="requires lxml")
+    def test_parse_entries_ignores_external_entities(self, tmp_path):
+        """Test that external entities are not expanded into entries."""
+        secret = tmp_path / 'secret.txt'
+        secret.write_text('SECRET-CONTENT')
+        feed = SAMPLE_FEED.replace(
+            b'<feed ',
+            f'<!DOCTYPE feed [<!ENTITY x SYSTEM "{secret.as_uri()}">]>\n<feed '.encode()
+        ).replace(b'Grain Boundary Migration', b'Grain Boundary &x;')
+        fetcher = ArxivFetcher(categories=['cond-mat.mtrl-sci'])
+        
+        papers = [fetcher._parse_entry(e) for e in fetcher._iter_entries(feed)]
+        
+        assert len(papers) == 2
+        assert all('SECRET-CONTENT' not in str(p) for p in papers)
+    
+    def test_parse_entries_elementtree(self, monkeypatch):
+        """Test parsing entries with the ElementTree fallback."""
+        import xml.etree.ElementTree
+        monkeypatch.setattr('arxiv_fetcher.ET', xml.etree.ElementTree)
+        monkeypatch.setattr('arxiv_fetcher.HAS_LXML', False)
+        fetcher = ArxivFetcher(categories=['cond-mat.mtrl-sci'])
+        
+        papers = [fetcher._parse_entry(e) for e in fetcher._iter_entries(SAMPLE_FEED)]
+        
+        assert [p['id'] for p in papers] == ['2401.00002v1', '2401.00001v1']
+        assert papers[0]['authors'] == ['Smith, J.', 'Doe, A.']
+        assert papers[0]['pdf_url'] == 'http://arxiv.org/pdf/2401.00002v1'
+    
+    def test_fetch_query_stops_at_cutoff(self, fake_arxiv):
+        """Test that entries older than the cutoff are not parsed."""
+        fetcher = ArxivFetcher(categories=['cond-mat.mtrl-sci'])
+        fetcher.cutoff_date_str = '2024-01-02T00:00:00Z'
+        
+        papers = fetcher._fetch_query('cat:cond-mat.mtrl-sci')
+        
+        assert [p['id'] for p in papers] == ['2401.00002v1']
+    
+    def test_fetch_query_not_modified(self, fake_arxiv, tmp_path):
+        """Test that a 304 response returns the cached papers."""
+        fetcher = ArxivFetcher(
+            categories=['cond-mat.mtrl-sci'],
+            cache=FeedCache(str(tmp_path / 'cache.sqlite'))
+        )
+        fetcher.cutoff_date_str = '2024-01-01T00:00:00Z'
+        
+        first = fetcher._fetch_query('cat:cond-mat.mtrl-sci')
+        second = fetcher._fetch_query('cat:cond-mat.mtrl-sci')
+        
+        assert fake_arxiv[1]['If-None-Match'] == '"abc"'
+        assert second == first
+        assert len(second) == 2
+    
+    def test_fetch_query_wider_window_refetches(self, fake_arxiv, tmp_path):
+        """Test that cached papers are not reused for an earlier cutoff."""
+        fetcher = ArxivFetcher(
+            categories=['cond-mat.mtrl-sci'],
+            cache=FeedCache(str(tmp_path / 'cache.sqlite'))
+        )
+        
+        fetcher.cutoff_date_str = '2024-01-02T00:00:00Z'
+        first = fetcher._fetch_query('cat:cond-mat.mtrl-sci')
+        
+        fetcher.cutoff_date_str = '2023-12-01T00:00:00Z'
+        second = fetcher._fetch_query('cat:cond-mat.mtrl-sci')
+        
+        assert len(first) == 1
+        assert 'If-None-Match' not in fake_arxiv[1]
+        assert len(second) == 2
+    
+    def test_fetch_papers_parallel_merges_results(self, monkeypatch):
+        """Test that per-query results are deduplicated and date filtered."""
+        fetcher = ArxivFetcher(
+            categories=['cond-mat.mtrl-sci', 'physics.comp-ph'],
+            time_window_hours=24
+        )
+        now = datetime.now(timezone.utc)
+        recent = {'id': '1', 'published': now - timedelta(hours=1)}
+        newest = {'id': '2', 'published': now}
+        old = {'id': '3', 'published': now - timedelta(hours=48)}
+        
+        queries = []
+        
+        def fake_fetch_query(query):
+            queries.append(query)
+            return [newest, recent, old] if 'dislocation' in query else [recent]
+        
+        monkeypatch.setattr(fetcher, '_fetch_query', fake_fetch_query)
+        
+        papers = fetcher.fetch_papers_parallel([['dislocation'], ['fracture', 'MD']])
+        
+        assert len(queries) == 4
+        assert 'cat:physics.comp-ph AND (all:fracture AND all:MD)' in queries
+        assert [p['id'] for p in papers] == ['2', '1']
 
 
 @pytest.mark.integration
@@ -0,0 +1,93 @@
+"""
+Unit tests for cache module
+Copyright (c) 2025 Erik Bitzek
+Licensed under GNU AGPL v3
+"""
+
+import pytest
+import sys
+from datetime import datetime, timezone
+from pathlib import Path
+
+# Add src to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+from cache import FeedCache, SummaryCache
+
+
+PAPER = {'id': '2401.00001v1', 'abstract': 'We study grain boundaries.'}
+
+
+class TestSummaryCache:
+    """Test cases for SummaryCache class."""
+
+    def test_roundtrip(self, tmp_path):
+        """Test storing and retrieving a summary."""
+        cache = SummaryCache(str(tmp_path / 'cache' / 'summaries.sqlite'))
+
+        assert cache.get(PAPER, 'gpt-4o-mini') is None
+
+        cache.set(PAPER, 'gpt-4o-mini', 'A summary.')
+
+        assert cache.get(PAPER, 'gpt-4o-mini') == 'A summary.'
+
+    def test_other_model_misses(self, tmp_path):
+        """Test that summaries from a different model are not reused."""
+        cache = SummaryCache(str(tmp_path / 'summaries.sqlite'))
+        cache.set(PAPER, 'gpt-4o-mini', 'A summary.')
+
+        assert cache.get(PAPER, 'gpt-4o') is None
+
+    def test_revised_abstract_misses(self, tmp_path):
+        """Test that a revised abstract invalidates the cached summary."""
+        cache = SummaryCache(str(tmp_path / 'summaries.sqlite'))
+        cache.set(PAPER, 'gpt-4o-mini', 'A summary.')
+
+        revised = dict(PAPER, abstract='We study grain boundaries in Cu.')
+
+        assert cache.get(revised, 'gpt-4o-mini') is None
+
+    def test_persists_across_instances(self, tmp_path):
+        """Test that summaries survive reopening the database."""
+        path = str(tmp_path / 'summaries.sqlite')
+        SummaryCache(path).set(PAPER, 'gpt-4o-mini', 'A summary.')
+
+        assert SummaryCache(path).get(PAPER, 'gpt-4o-mini') == 'A summary.'
+
+
+class TestFeedCache:
+    """Test cases for FeedCache class."""
+
+    def test_roundtrip(self, tmp_path):
+        """Test that papers and validators survive a roundtrip."""
+        cache = FeedCache(str(tmp_path / 'summaries.sqlite'))
+        published = datetime(2024, 1, 2, 10, 0, tzinfo=timezone.utc)
+        papers = [dict(PAPER, published=published, updated=published)]
+
+        assert cache.get_validators('query') is None
+        assert cache.get_papers('query') == []
+
+        cache.set('query', '"abc"', None, '2024-01-01T00:00:00Z', papers)
+        cached = cache.get_validators('query')
+
+        assert cached['etag'] == '"abc"'
+        assert cached['last_modified'] is None
+        assert cached['cutoff'] == '2024-01-01T00:00:00Z'
+        assert cache.get_papers('query') == papers
+
+    def test_roundtrip_without_orjson(self, monkeypatch, tmp_path):
+        """Test the stdlib json fallback when orjson is not installed."""
+        monkeypatch.setattr('cache.orjson', None)
+        cache = FeedCache(str(tmp_path / 'summaries.sqlite'))
+        published = datetime(2024, 1, 2, 10, 0, tzinfo=timezone.utc)
+        papers = [dict(PAPER, published=published, updated=published)]
+
+        cache.set('query', None, 'Tue, 02 Jan 2024 10:00:00 GMT',
+                  '2024-01-01T00:00:00Z', papers)
+
+        assert cache.get_papers('query') == papers
+
+
+if __name__ == '__main__':
+    # Run tests
+    pytest.main([__file__, '-v'])
@@ -0,0 +1,107 @@
+"""
+Unit tests for notifier module
+Copyright (c) 2025 Erik Bitzek
+Licensed under GNU AGPL v3
+"""
+
+import pytest
+import sys
+from pathlib import Path
+
+# Add src to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+from notifier import DigestNotifier
+
+
+class FakeSMTP:
+    """Stand-in for smtplib.SMTP recording the conversation."""
+
+    instances = []
+
+    def __init__(self, host, port, timeout=None):
+        self.host = host
+        self.port = port
+        self.calls = []
+        self.sent = []
+        FakeSMTP.instances.append(self)
+
+    def set_debuglevel(self, level):
+        pass
+
+    def starttls(self):
+        self.calls.append('starttls')
+
+    def login(self, user, password):
+        self.calls.append('login')
+
+    def send_message(self, msg, to_addrs=None):
+        self.calls.append('send_message')
+        self.sent.append((msg, to_addrs))
+
+    def quit(self):
+        self.calls.append('quit')
+
+
+class FakeSMTPSSL(FakeSMTP):
+    """Stand-in for smtplib.SMTP_SSL."""
+
+
+@pytest.fixture
+def smtp(monkeypatch):
+    """Replace SMTP classes with fakes and set credentials."""
+    FakeSMTP.instances = []
+    monkeypatch.setattr('notifier.smtplib.SMTP', FakeSMTP)
+    monkeypatch.setattr('notifier.smtplib.SMTP_SSL', FakeSMTPSSL)
+    monkeypatch.setenv('SMTP_SERVER', 'smtp.example.com')
+    monkeypatch.setenv('SMTP_PORT', '587')
+    monkeypatch.setenv('SMTP_USER', 'digest@example.com')
+    monkeypatch.setenv('SMTP_PASSWORD', 'secret')
+    return FakeSMTP.instances
+
+
+class TestSendEmail:
+    """Test cases for DigestNotifier.send_email."""
+
+    def test_single_recipient(self, smtp):
+        """Test that a single recipient is addressed directly."""
+        assert DigestNotifier().send_email('Digest', 'a@example.com')
+
+        server = smtp[0]
+        assert type(server) is FakeSMTP
+        assert server.calls == ['starttls', 'login', 'send_message', 'quit']
+
+        msg, to_addrs = server.sent[0]
+        assert msg['To'] == 'a@example.com'
+        assert to_addrs == ['a@example.com']
+
+    def test_multiple_recipients_bcc(self, smtp):
+        """Test that several recipients get one BCC message on one connection."""
+        recipients = ['a@example.com', 'b@example.com']
+
+        assert DigestNotifier().send_email('Digest', recipients)
+
+        assert len(smtp) == 1
+        server = smtp[0]
+        assert server.calls.count('login') == 1
+        assert len(server.sent) == 1
+
+        msg, to_addrs = server.sent[0]
+        assert msg['To'] == 'digest@example.com'
+        assert to_addrs == recipients
+
+    def test_port_465_uses_implicit_tls(self, smtp, monkeypatch):
+        """Test that port 465 connects with SMTP_SSL and skips STARTTLS."""
+        monkeypatch.setenv('SMTP_PORT', '465')
+
+        assert DigestNotifier().send_email('Digest', 'a@example.com')
+
+        server = smtp[0]
+        assert type(server) is FakeSMTPSSL
+        assert 'starttls' not in server.calls
+        assert server.port == 465
+
+
+if __name__ == '__main__':
+    # Run tests
+    pytest.main([__file__, '-v'])
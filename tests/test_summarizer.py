@@ -0,0 +1,284 @@
+"""
+Unit tests for summarizer module
+Copyright (c) 2025 Erik Bitzek
+Licensed under GNU AGPL v3
+"""
+
+import json
+import pytest
+import sys
+import time
+import types
+from pathlib import Path
+from types import SimpleNamespace
+
+# Add src to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+from cache import SummaryCache
+
+
+def make_papers(n):
+    """Build n minimal paper dictionaries."""
+    return [
+        {'id': f'2401.0000{i}', 'title': f'Paper {i}',
+         'authors': ['Smith, J.'], 'abstract': f'Abstract {i}.'}
+        for i in range(n)
+    ]
+
+
+class FakeStream:
+    """Streamed chat completion yielding one word per chunk."""
+
+    def __init__(self, text):
+        self.words = text.split(' ')
+        self.closed = False
+
+    def __iter__(self):
+        # Usage-only chunks have no choices
+        yield SimpleNamespace(choices=[])
+        for i, word in enumerate(self.words):
+            content = word if i == 0 else ' ' + word
+            delta = SimpleNamespace(content=content)
+            yield SimpleNamespace(choices=[SimpleNamespace(delta=delta)])
+
+    def close(self):
+        self.closed = True
+
+
+class FakeCompletions:
+    """Chat completions endpoint returning a fixed text per call."""
+
+    def __init__(self, text='A summary.'):
+        self.text = text
+        self.calls = []
+
+    def create(self, **kwargs):
+        self.calls.append(kwargs)
+        return FakeStream(self.text)
+
+
+class FakeFiles:
+    """Files endpoint answering batch requests from the uploaded input."""
+
+    def __init__(self, failed_ids=(), error=None):
+        self.failed_ids = failed_ids
+        self.error = error
+        self.requests = []
+
+    def create(self, file, purpose):
+        if self.error:
+            raise self.error
+        self.requests = [json.loads(line) for line in file[1].read().splitlines()]
+        return SimpleNamespace(id='file-in')
+
+    def content(self, file_id):
+        lines = []
+        for request in self.requests:
+            custom_id = request['custom_id']
+            if custom_id in self.failed_ids:
+                result = {'custom_id': custom_id,
+                          'response': {'status_code': 500, 'body': {}},
+                          'error': 'server error'}
+            else:
+                message = {'content': f' S{custom_id} '}
+                result = {'custom_id': custom_id,
+                          'response': {'status_code': 200,
+                                       'body': {'choices': [{'message': message}]}}}
+            lines.append(json.dumps(result))
+        return SimpleNamespace(text='\n'.join(lines))
+
+
+class FakeBatches:
+    """Batches endpoint completing after a number of polls."""
+
+    def __init__(self, polls=1):
+        self.polls = polls
+        self.cancelled = False
+
+    def _batch(self, status):
+        return SimpleNamespace(id='batch-1', status=status, request_counts=None,
+                               output_file_id='file-out')
+
+    def create(self, **kwargs):
+        return self._batch('validating')
+
+    def retrieve(self, batch_id):
+        self.polls -= 1
+        return self._batch('completed' if self.polls <= 0 else 'in_progress')
+
+    def cancel(self, batch_id):
+        self.cancelled = True
+
+
+class FakeClient:
+    """Stand-in for openai.OpenAI."""
+
+    def __init__(self, completions=None, files=None, batches=None):
+        self.chat = SimpleNamespace(completions=completions or FakeCompletions())
+        self.files = files or FakeFiles()
+        self.batches = batches or FakeBatches()
+
+
+def make_summarizer(monkeypatch, client, **kwargs):
+    """Create a PaperSummarizer that talks to a fake client."""
+    # The client is faked, so when openai is not installed a stub module
+    # is enough to import summarizer; it is removed again after the test
+    try:
+        import openai  # noqa: F401
+    except ImportError:
+        monkeypatch.setitem(sys.modules, 'openai',
+                            types.SimpleNamespace(OpenAI=None))
+    import summarizer
+
+    monkeypatch.setenv('OPENAI_API_KEY', 'test-key')
+    monkeypatch.setattr(summarizer, 'OpenAI', lambda **client_kwargs: client)
+    return summarizer.PaperSummarizer(**kwargs)
+
+
+class TestSummarizePaper:
+    """Test cases for streamed single-paper summaries."""
+
+    def test_full_response_cached(self, monkeypatch, tmp_path):
+        """Test that a complete streamed summary is returned and cached."""
+        cache = SummaryCache(str(tmp_path / 'summaries.sqlite'))
+        client = FakeClient(completions=FakeCompletions('One. Two three.'))
+        summarizer = make_summarizer(monkeypatch, client, cache=cache)
+        paper = make_papers(1)[0]
+
+        assert summarizer.summarize_paper(paper) == 'One. Two three.'
+        assert cache.get(paper, summarizer.model) == 'One. Two three.'
+        assert client.chat.completions.calls[0]['stream'] is True
+
+    def test_word_budget_trims_to_sentence(self, monkeypatch, tmp_path):
+        """Test that a summary cut by the word budget keeps whole sentences."""
+        cache = SummaryCache(str(tmp_path / 'summaries.sqlite'))
+        client = FakeClient(completions=FakeCompletions(
+            'First sentence here. Second one is cut off somewhere in the middle'
+        ))
+        summarizer = make_summarizer(monkeypatch, client, cache=cache, max_words=6)
+        paper = make_papers(1)[0]
+
+        assert summarizer.summarize_paper(paper) == 'First sentence here.'
+        assert cache.get(paper, summarizer.model) == 'First sentence here.'
+
+    def test_word_budget_without_sentence_not_cached(self, monkeypatch, tmp_path):
+        """Test that a cut summary without a sentence end is not cached."""
+        cache = SummaryCache(str(tmp_path / 'summaries.sqlite'))
+        client = FakeClient(completions=FakeCompletions(
+            'w1 w2 w3 w4 w5 w6 w7 w8'
+        ))
+        summarizer = make_summarizer(monkeypatch, client, cache=cache, max_words=5)
+        paper = make_papers(1)[0]
+
+        assert summarizer.summarize_paper(paper) == 'w1 w2 w3 w4 w5'
+        assert cache.get(paper, summarizer.model) is None
+
+
+class TestSummarizePapers:
+    """Test cases for concurrent summarization."""
+
+    def test_order_preserved(self, monkeypatch):
+        """Test that results keep input order when completing out of order."""
+        summarizer = make_summarizer(monkeypatch, FakeClient())
+        papers = make_papers(4)
+        delays = {p['id']: 0.03 * (4 - i) for i, p in enumerate(papers)}
+
+        def fake_summarize_paper(paper):
+            time.sleep(delays[paper['id']])
+            return f"S{paper['id']}"
+
+        monkeypatch.setattr(summarizer, 'summarize_paper', fake_summarize_paper)
+
+        result = summarizer.summarize_papers(papers, show_progress=False)
+
+        assert result is papers
+        assert [p['summary'] for p in papers] == [f"S{p['id']}" for p in papers]
+
+    def test_missing_summary_marked_unavailable(self, monkeypatch):
+        """Test that failed summaries become 'Summary unavailable'."""
+        summarizer = make_summarizer(monkeypatch, FakeClient())
+        papers = make_papers(3)
+
+        def fake_summarize_paper(paper):
+            if paper['id'] == papers[1]['id']:
+                return None
+            if paper['id'] == papers[2]['id']:
+                raise RuntimeError('boom')
+            return 'A summary.'
+
+        monkeypatch.setattr(summarizer, 'summarize_paper', fake_summarize_paper)
+
+        summarizer.summarize_papers(papers, show_progress=False)
+
+        assert [p['summary'] for p in papers] == [
+            'A summary.', 'Summary unavailable', 'Summary unavailable'
+        ]
+
+
+class TestSummarizePapersBatch:
+    """Test cases for the Batch API path."""
+
+    def test_batch_success(self, monkeypatch):
+        """Test that batch results are joined back to papers by custom_id."""
+        client = FakeClient(batches=FakeBatches(polls=2))
+        summarizer = make_summarizer(monkeypatch, client)
+        papers = make_papers(3)
+
+        result = summarizer.summarize_papers_batch(papers, poll_interval=0)
+
+        assert result is papers
+        assert [p['summary'] for p in papers] == [f"S{p['id']}" for p in papers]
+        assert [r['custom_id'] for r in client.files.requests] == [p['id'] for p in papers]
+        assert client.files.requests[0]['url'] == '/v1/chat/completions'
+        assert client.chat.completions.calls == []
+
+    def test_batch_partial_failure(self, monkeypatch):
+        """Test that failed batch requests are retried individually."""
+        papers = make_papers(3)
+        client = FakeClient(
+            completions=FakeCompletions('Retried summary.'),
+            files=FakeFiles(failed_ids={papers[1]['id']})
+        )
+        summarizer = make_summarizer(monkeypatch, client)
+
+        summarizer.summarize_papers_batch(papers, poll_interval=0, show_progress=False)
+
+        assert [p['summary'] for p in papers] == [
+            f"S{papers[0]['id']}", 'Retried summary.', f"S{papers[2]['id']}"
+        ]
+        assert len(client.chat.completions.calls) == 1
+
+    def test_batch_exception_falls_back(self, monkeypatch):
+        """Test that a failing batch falls back to per-paper requests."""
+        client = FakeClient(
+            completions=FakeCompletions('Fallback summary.'),
+            files=FakeFiles(error=RuntimeError('upload failed'))
+        )
+        summarizer = make_summarizer(monkeypatch, client)
+        papers = make_papers(2)
+
+        summarizer.summarize_papers_batch(papers, poll_interval=0, show_progress=False)
+
+        assert [p['summary'] for p in papers] == ['Fallback summary.'] * 2
+        assert len(client.chat.completions.calls) == 2
+
+    def test_batch_timeout_cancels_and_falls_back(self, monkeypatch):
+        """Test that a batch exceeding the timeout is cancelled."""
+        client = FakeClient(
+            completions=FakeCompletions('Fallback summary.'),
+            batches=FakeBatches(polls=100)
+        )
+        summarizer = make_summarizer(monkeypatch, client)
+        papers = make_papers(2)
+
+        summarizer.summarize_papers_batch(papers, poll_interval=0, timeout=-1,
+                                          show_progress=False)
+
+        assert client.batches.cancelled
+        assert [p['summary'] for p in papers] == ['Fallback summary.'] * 2
+
+
+if __name__ == '__main__':
+    # Run tests
+    pytest.main([__file__, '-v'])